@@ -1,29 +1,84 @@
 #!/usr/bin/env python3
 
 import argparse
+import bisect
+import contextlib
+import functools
 import json
 import os
+import queue
 import random
 import re
 import signal
 import subprocess
 import sys
+import tempfile
+import textwrap
+import threading
 import time
-from collections import defaultdict
-from datetime import datetime
-
-import prettytable
-import requests
+import unicodedata
+from collections import OrderedDict, defaultdict
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from operator import itemgetter
+
+try:
+    import orjson
+except ImportError:  # Optional speedup; the stdlib json module is the fallback
+    orjson = None
+
+try:
+    import ahocorasick
+except ImportError:  # Optional; keyword lists fall back to a regex alternation
+    ahocorasick = None
+
+try:
+    import fcntl
+except ImportError:  # Not available on Windows; cache writes go unlocked there
+    fcntl = None
 
 # === CONFIGURATION ===
 HAMMER_DELAY_RANGE = (2, 4)  # Seconds between requests
+HTTP_TIMEOUT = (3.05, 10)  # Connect and read timeouts (seconds) per HTTP request
+SEEN_CACHE_MIN = 200  # Seen video IDs always kept per channel
+SEEN_LOG_COMPACT_RATIO = 2  # Rewrite the snapshot once the journal is this much larger
+PENDING_SAVE_EVERY = 10  # Sends between rewrites of the pending-messages file
+MAX_MESSAGE_CHARS = 4000  # Telegram caps a message at 4096 characters
+MESSAGE_SEPARATOR = "\n\n---\n\n"
+YOUTUBE_FEED_URL = "https://www.youtube.com/feeds/videos.xml?channel_id={}"
+# Only the listing fields filters, messages and channel naming read, as one JSON line
+LISTING_FIELDS = (
+    "id",
+    "title",
+    "url",
+    "duration",
+    "description",
+    "upload_date",
+    "channel",
+    "channel_id",
+    "uploader",
+    "playlist_channel",
+    "playlist_channel_id",
+    "playlist_id",
+    "playlist_title",
+    "playlist_uploader",
+)
+LISTING_TEMPLATE = "%(.{" + ",".join(LISTING_FIELDS) + "})j"
 cache_file = ""
+seen_log_file = ""
+pending_file = ""
 regex_file = ""
 channels_file = ""
 netrc_file = ""
+cookie_file = ""
+ydl_cache_dir = ""
 using_netrc = False
 telegram_dispatch = True
 webhook_dispatch = True
+batch_messages = False
+fetch_workers = 4
+yt_dlp = None  # Set to the imported module when running with --use-lib
+assume_sorted = True  # Listings are newest-first, so scans may stop at a seen video
+interval_hours = 0.0  # Default per-channel check interval, from --interval-hours
 
 # ANSI color codes
 ANSI_BLUE = "\033[94m"
@@ -32,15 +87,28 @@ ANSI_GREEN = "\033[92m"
 ANSI_RED = "\033[91m"
 ANSI_GREY = "\033[90m"
 ANSI_RESET = "\033[0m"
+ANSI_GREEN_FMT = ANSI_GREEN + "{}" + ANSI_RESET
+ANSI_RED_FMT = ANSI_RED + "{}" + ANSI_RESET
+ANSI_PATTERN = re.compile(r"\033\[[0-9;]*m")
+ANSI_SPLIT_PATTERN = re.compile(r"(\033\[[0-9;]*m)")
 
 # === GLOBALS ===
 message_queue = []
+stop_event = threading.Event()  # Set by the signal handler to end interval waits
+loaded_files = {}  # File paths -> (stat signature, parsed data), kept between scans
+feed_state = {}  # Channel URL -> YouTube channel ID, last listing IDs, feed ETag
+last_checked = {}  # Channel URL -> monotonic time its last scan started
+ytdlp_pool = queue.SimpleQueue()  # Idle YoutubeDL instances shared by all calls
+
+http_session = None  # Shared keep-alive session, created by get_http_session()
+http_session_lock = threading.Lock()
 
 # === FUNCTIONS ===
 
 
 def handle_signal(signum, frame):
     print(f"Received signal {signum}, exiting.")
+    stop_event.set()
     sys.exit(0)
 
 
@@ -49,27 +117,59 @@ signal.signal(signal.SIGTERM, handle_signal)
 
 
 def ensure_dir(directory):
-    if not os.path.exists(directory):
-        os.makedirs(directory)
+    os.makedirs(directory, exist_ok=True)
+
+
+def dir_names(directory):
+    """Names in a directory from a single scandir, empty if it is not a directory."""
+    try:
+        with os.scandir(directory) as entries:
+            return {entry.name for entry in entries}
+    except (FileNotFoundError, NotADirectoryError):
+        return set()
+
+
+def json_loads(data):
+    return orjson.loads(data) if orjson else json.loads(data)
 
 
 def load_json(file_path, default):
-    if not os.path.exists(file_path):
+    try:
+        with open(file_path, "rb") as f:
+            return json_loads(f.read())
+    except FileNotFoundError:
         return default
-    with open(file_path, "r") as f:
-        return json.load(f)
 
 
 def save_json(file_path, data):
-    with open(file_path, "w") as f:
-        json.dump(data, f, indent=2)
+    if orjson:
+        encoded = orjson.dumps(data, option=orjson.OPT_INDENT_2)
+    else:
+        encoded = json.dumps(data, indent=2).encode()
+    try:
+        with open(file_path, "rb") as f:
+            if f.read() == encoded:
+                return  # Unchanged; skip the rewrite
+    except FileNotFoundError:
+        pass
+    # Write a sibling temp file, flush it to disk and swap it in, so neither a crash
+    # nor a power loss can leave the target truncated
+    tmp_path = file_path + ".tmp"
+    with open(tmp_path, "wb") as f:
+        f.write(encoded)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp_path, file_path)
+    loaded_files.pop((file_path,), None)  # Never serve a stale parse after a write
 
 
 def load_config(config_file):
-    config = load_json(config_file, {})
-    while not config:
+    """Return the parsed config, re-reading it only when the file changes."""
+    while True:
+        config = load_if_changed((config_file,), lambda: load_json(config_file, {}))
+        if config:
+            return config
         edit_config(config_file)
-    return config
 
 
 def edit_config(config_file):
@@ -115,59 +215,358 @@ def load_channels(channels_file, skip_add=False):
     return channels
 
 
+def channel_sort_key(channel):
+    return channel.get("url", "")
+
+
 def save_channels(channels_file, channels):
-    save_json(channels_file, sorted(channels, key=lambda x: x.get("url", "")))
+    # Callers keep the list sorted by URL (see bisect.insort in add mode)
+    save_json(channels_file, channels)
 
 
 def load_cache(cache_file):
-    return load_json(cache_file, {})
+    cache = {
+        url: OrderedDict.fromkeys(ids) for url, ids in load_json(cache_file, {}).items()
+    }
+    try:
+        with open(seen_log_file, "rb") as f:
+            lines = f.read().splitlines()
+    except FileNotFoundError:
+        lines = []
+    for line in lines:
+        try:
+            entry = json_loads(line)
+        except json.JSONDecodeError:
+            continue  # Torn final line from an interrupted append
+        ids = cache.setdefault(entry["url"], OrderedDict())
+        ids[entry["id"]] = None
+        ids.move_to_end(entry["id"])
+    return cache
+
+
+@contextlib.contextmanager
+def cache_lock():
+    """Serialize seen-cache and pending-queue writes across running instances."""
+    if fcntl is None:
+        with keep_cache_current():
+            yield
+        return
+    with open(cache_file + ".lock", "a") as f:
+        fcntl.flock(f, fcntl.LOCK_EX)
+        with keep_cache_current():
+            yield
+
+
+@contextlib.contextmanager
+def keep_cache_current():
+    # Re-stamp the in-memory cache after our own write, unless another process
+    # wrote since it was loaded; then the next load_if_changed must reload it.
+    paths = (cache_file, seen_log_file)
+    cached = loaded_files.get(paths)
+    current = cached is not None and cached[0] == file_signature(paths)
+    yield
+    if current:
+        remember_files(paths, cached[1])
 
 
 def save_cache(cache_file, cache):
-    save_json(cache_file, cache)
+    save_json(cache_file, {url: list(ids) for url, ids in cache.items()})
+    # The snapshot now holds everything the journal recorded
+    open(seen_log_file, "w").close()
+
+
+def merge_cache(cache, other):
+    for url, ids in other.items():
+        known = cache.setdefault(url, OrderedDict())
+        for video_id in ids:
+            known.setdefault(video_id)
+
+
+def append_seen(url, video_id):
+    with cache_lock(), open(seen_log_file, "a") as f:
+        f.write(json.dumps({"url": url, "id": video_id}) + "\n")
+
+
+def file_signature(paths):
+    signature = []
+    for path in paths:
+        try:
+            stat = os.stat(path)
+            signature.append((stat.st_mtime_ns, stat.st_size))
+        except FileNotFoundError:
+            signature.append(None)
+    return tuple(signature)
+
+
+def remember_files(paths, data):
+    loaded_files[paths] = (file_signature(paths), data)
+
 
+def load_if_changed(paths, loader):
+    """Return the data last loaded from `paths`, reloading only if a file changed."""
+    signature = file_signature(paths)
+    cached = loaded_files.get(paths)
+    if cached and cached[0] == signature:
+        return cached[1]
+    data = loader()
+    loaded_files[paths] = (signature, data)
+    return data
+
+
+def seen_cap(channel):
+    # Anything older than this can no longer show up in a --playlist-end scan
+    return max(2 * channel.get("playlist_end", 25), SEEN_CACHE_MIN)
+
+
+def compact_cache(cache_file, ratio=0):
+    """Fold the journal into the snapshot once it outgrows `ratio` x the snapshot."""
+    try:
+        log_size = os.path.getsize(seen_log_file)
+    except FileNotFoundError:
+        return
+    snapshot_size = os.path.getsize(cache_file) if os.path.exists(cache_file) else 0
+    if log_size and log_size > ratio * snapshot_size:
+        with cache_lock():
+            save_cache(cache_file, load_cache(cache_file))
+
+
+def ytdlp_options():
+    options = {
+        "extract_flat": "in_playlist",
+        "quiet": True,
+        "no_warnings": True,
+        "nocheckcertificate": True,
+        "cookiefile": cookie_file,
+        "cachedir": ydl_cache_dir,
+    }
+    if using_netrc:
+        options.update(usenetrc=True, netrc_location=netrc_file)
+    return options
+
+
+@contextlib.contextmanager
+def pooled_ytdlp():
+    """Borrow an idle YoutubeDL, creating one only when every instance is busy."""
+    try:
+        ydl = ytdlp_pool.get_nowait()
+    except queue.Empty:
+        ydl = yt_dlp.YoutubeDL(ytdlp_options())
+    try:
+        yield ydl
+    finally:
+        ytdlp_pool.put(ydl)
+
+
+def save_ytdlp_cookies():
+    """Merge the pooled instances' cookies and swap them into the jar atomically."""
+    idle = []
+    while True:
+        try:
+            idle.append(ytdlp_pool.get_nowait())
+        except queue.Empty:
+            break
+    try:
+        if idle:
+            jar = idle[0].cookiejar
+            for ydl in idle[1:]:
+                for cookie in ydl.cookiejar:
+                    jar.set_cookie(cookie)
+            temp_path = cookie_file + ".tmp"
+            jar.save(temp_path)
+            os.replace(temp_path, cookie_file)
+    finally:
+        for ydl in idle:
+            ytdlp_pool.put(ydl)
+
+
+def get_latest_videos_lib(channel_url, playlist_end=None):
+    try:
+        with pooled_ytdlp() as ydl:
+            # Read per extraction, so a pooled instance can serve any channel
+            ydl.params["playlistend"] = playlist_end
+            data = ydl.extract_info(channel_url, download=False)
+    except yt_dlp.utils.DownloadError as e:
+        print(f"{ANSI_RED}yt-dlp error:{ANSI_RESET}", e)
+        return [], None
+
+    # Flat entries can omit fields, so give every listing field a default
+    videos = [
+        {**dict.fromkeys(LISTING_FIELDS), **entry}
+        for entry in data.get("entries") or []
+    ]
+    for video in videos:
+        prepare_video(video)
+    remember_listing(channel_url, data, videos, data.get("id"))
+    return videos[::-1], data.get("channel") or data.get("title") or data.get(
+        "uploader"
+    )
+
+
+def get_latest_videos(channel_url, playlist_end=None, stop_ids=None):
+    """Return (videos oldest-first, channel name), stopping at the first seen ID."""
+    if yt_dlp:
+        return get_latest_videos_lib(channel_url, playlist_end=playlist_end)
 
-def get_latest_videos(channel_url, playlist_end=None):
     cmd = [
         "yt-dlp",
         "--flat-playlist",
-        "--dump-single-json",
+        "--print",
+        LISTING_TEMPLATE,
         "--no-warnings",
         "--no-check-certificate",
+        "--cache-dir",
+        ydl_cache_dir,
         channel_url,
     ]
 
     if playlist_end:
-        cmd[5:5] = ["--playlist-end", str(playlist_end)]
+        cmd[-1:-1] = ["--playlist-end", str(playlist_end)]
     if using_netrc:
         cmd[1:1] = ["--netrc", "--netrc-location", netrc_file]
 
-    result = subprocess.run(cmd, capture_output=True, text=True)
-    if result.returncode != 0:
-        print(f"{ANSI_RED}yt-dlp error:{ANSI_RESET}", result.stderr)
+    videos = []
+    stopped = False
+    # Raw bytes go straight to the JSON parser, skipping a decode per line.
+    # stderr goes to a file, as a full stderr pipe would stall yt-dlp's stdout.
+    with tempfile.TemporaryFile() as err_file:
+        with subprocess.Popen(cmd, stdout=subprocess.PIPE, stderr=err_file) as proc:
+            try:
+                for line in proc.stdout:
+                    # The template drops null fields; restore them as None
+                    video = dict.fromkeys(LISTING_FIELDS)
+                    video.update(json_loads(line))
+                    prepare_video(video)
+                    videos.append(video)
+                    if stop_ids and video.get("id") in stop_ids:
+                        # Everything older than a seen video was already scanned
+                        stopped = True
+                        proc.kill()
+                        break
+            except json.JSONDecodeError:
+                proc.kill()
+                print(f"{ANSI_RED}Failed to parse yt-dlp output.{ANSI_RESET}")
+                if not using_netrc:
+                    print(
+                        f"{ANSI_YELLOW}Tip: Create a netrc file at {netrc_file} if the video requires login.{ANSI_RESET}"
+                    )
+                return [], None
+        err_file.seek(0)
+        stderr = err_file.read().decode(errors="replace")
+
+    if proc.returncode != 0 and not stopped:
+        print(f"{ANSI_RED}yt-dlp error:{ANSI_RESET}", stderr)
         return [], None
-    try:
-        data = json.loads(result.stdout)
-        return data.get("entries", [])[::-1], data.get("channel") or data.get(
-            "title"
-        ) or data.get("uploader")
-    except json.JSONDecodeError:
-        print(f"{ANSI_RED}Failed to parse yt-dlp output.{ANSI_RESET}")
-        if not using_netrc:
-            print(
-                f"{ANSI_YELLOW}Tip: Create a netrc file at {netrc_file} if the video requires login.{ANSI_RESET}"
-            )
+    if not videos:
         return [], None
 
+    first = videos[0]
+    remember_listing(channel_url, first, videos, first.get("playlist_id"))
+    cname = (
+        first.get("playlist_channel")
+        or first.get("channel")
+        or first.get("playlist_title")
+        or first.get("playlist_uploader")
+        or first.get("uploader")
+    )
+    return videos[::-1], cname
+
+
+def remember_listing(channel_url, entry, videos, playlist_id):
+    channel_id = (
+        entry.get("playlist_channel_id") or entry.get("channel_id") or playlist_id or ""
+    )
+    # The feed only covers the channel's own uploads, not playlists it owns
+    if (
+        "youtube.com" in channel_url
+        and channel_id.startswith("UC")
+        and playlist_id in (channel_id, "UU" + channel_id[2:])
+    ):
+        feed_state[channel_url] = {
+            "channel_id": channel_id,
+            "ids": {video.get("id") for video in videos},
+        }
+
+
+def get_http_session():
+    """Return the shared session, importing requests only once it is needed."""
+    global http_session
+    with http_session_lock:
+        if http_session is None:
+            import requests
+            from requests.adapters import HTTPAdapter
+            from urllib3.util.retry import Retry
+
+            # Transient 5xx responses are retried here; 429s keep their own handling
+            retries = Retry(
+                total=3,
+                backoff_factor=1,
+                status_forcelist=(500, 502, 503, 504),
+                allowed_methods=None,
+                raise_on_status=False,
+                respect_retry_after_header=False,
+            )
+            http_session = requests.Session()
+            http_session.mount(
+                "https://",
+                HTTPAdapter(pool_connections=4, pool_maxsize=16, max_retries=retries),
+            )
+    return http_session
+
+
+def feed_unchanged(channel_url):
+    """True if the YouTube RSS feed shows no upload since the last listing."""
+    state = feed_state.get(channel_url)
+    if not state:
+        return False
+
+    import requests
+
+    headers = {"If-None-Match": state["etag"]} if state.get("etag") else {}
+    try:
+        response = get_http_session().get(
+            YOUTUBE_FEED_URL.format(state["channel_id"]),
+            headers=headers,
+            timeout=HTTP_TIMEOUT,
+        )
+    except requests.RequestException:
+        return False
+
+    if response.status_code == 304:
+        return True
+    if response.status_code != 200:
+        return False
+
+    # Any new upload would be the newest feed entry, so it would be unlisted
+    newest = re.search(r"<yt:videoId>([^<]+)</yt:videoId>", response.text)
+    if not newest or newest.group(1) not in state["ids"]:
+        return False
+    state["etag"] = response.headers.get("ETag")
+    return True
+
+
+def get_video_upload_date_lib(video_url):
+    try:
+        with pooled_ytdlp() as ydl:
+            info = ydl.extract_info(video_url, download=False, process=False)
+    except yt_dlp.utils.DownloadError as e:
+        print(f"{ANSI_RED}yt-dlp error while fetching metadata:{ANSI_RESET} {e}")
+        return None
+    return format_upload_date(str(info.get("timestamp")), info.get("upload_date") or "")
+
 
 def get_video_upload_date(video_url):
     """Return upload_date in yyyymmdd format from a video URL using yt-dlp."""
+    if yt_dlp:
+        return get_video_upload_date_lib(video_url)
+
     cmd = [
         "yt-dlp",
         "--no-warnings",
         "--no-check-certificate",
         "--print",
         "%(timestamp)s,%(upload_date)s",
+        "--cache-dir",
+        ydl_cache_dir,
         video_url,
     ]
 
@@ -191,12 +590,13 @@ def get_video_upload_date(video_url):
         return None
 
     timestamp_str, upload_date_str = output.split(",", 1)
+    return format_upload_date(timestamp_str, upload_date_str)
+
 
+def format_upload_date(timestamp_str, upload_date_str):
     try:
         timestamp = int(timestamp_str)
-        dt = datetime.fromtimestamp(timestamp)
-        dt_str = dt.strftime("%Y-%m-%dT%H:%M:%SZ")
-        return dt_str
+        return time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime(timestamp))
     except ValueError:
         if upload_date_str and re.fullmatch(r"\d{8}", upload_date_str):
             return upload_date_str
@@ -205,53 +605,236 @@ def get_video_upload_date(video_url):
         return None
 
 
-def matches_filters(info, criteria):
-    title = info.get("title", "").lower()
-    description = info.get("description", "").lower()
-    duration = info.get("duration", 0)
+@functools.lru_cache(maxsize=256)
+def keyword_matcher(words):
+    """Return a callable testing lowercased text for any of the given keywords."""
+    lowered = tuple(word.lower() for word in words)
+    if len(lowered) < 4:
+        return lambda text: any(word in text for word in lowered)
+    if "" in lowered:
+        return lambda text: True  # An empty keyword matches everything
+    if ahocorasick:
+        automaton = ahocorasick.Automaton()
+        for word in lowered:
+            automaton.add_word(word, word)
+        automaton.make_automaton()
+        return lambda text: next(automaton.iter(text), None) is not None
+    # One alternation scans the text once in C instead of once per keyword
+    return re.compile("|".join(map(re.escape, lowered))).search
 
-    includes = criteria.get("title_include", [])
-    if includes and not any(word.lower() in title for word in includes):
-        return False
 
-    excludes = criteria.get("title_exclude", [])
-    if any(word.lower() in title for word in excludes):
-        return False
+def prepare_video(info):
+    """Memoize the lowercased title and description on the video dict."""
+    if "_title_lc" not in info:
+        info["_title_lc"] = (info.get("title") or "").lower()
+        info["_desc_lc"] = (info.get("description") or "").lower()
+    return info["_title_lc"], info["_desc_lc"]
 
-    desc_includes = criteria.get("description_include", [])
-    if desc_includes and not any(word.lower() in description for word in desc_includes):
-        return False
 
-    desc_excludes = criteria.get("description_exclude", [])
-    if any(word.lower() in description for word in desc_excludes):
-        return False
+def keyword_check(matcher, use_description, reason, wanted):
+    def check(info):
+        title, description = prepare_video(info)
+        if bool(matcher(description if use_description else title)) != wanted:
+            return reason
+
+    return check
+
+
+def compile_criteria(criteria):
+    """Return a check(info) -> (matched, reason) that runs only configured criteria."""
+    checks = []
 
+    # Integer duration bounds go first; they are far cheaper than text scans
     min_length = criteria.get("min_length_seconds", 0)
-    if min_length and duration < min_length:
-        return False
+    if min_length:
+
+        def too_short(info):
+            duration = info.get("duration") or 0
+            if duration < min_length:
+                return f"Too short ({duration}s)"
+
+        checks.append(too_short)
 
     max_length = criteria.get("max_length_seconds", 0)
-    if max_length and duration > max_length:
-        return False
+    if max_length:
+
+        def too_long(info):
+            duration = info.get("duration") or 0
+            if duration > max_length:
+                return f"Too long ({duration}s)"
+
+        checks.append(too_long)
+
+    for field, use_description, label, wanted in (
+        ("title_include", False, "Title missing", True),
+        ("title_exclude", False, "Title excluded", False),
+        ("description_include", True, "Description missing", True),
+        ("description_exclude", True, "Description excluded", False),
+    ):
+        words = criteria.get(field, [])
+        if words:
+            matcher = keyword_matcher(tuple(words))
+            checks.append(
+                keyword_check(matcher, use_description, f"{label}: {words}", wanted)
+            )
 
-    return True
+    if not checks:
+        return lambda info, explain=True: (True, "Matched")
+
+    def check(info, explain=True):
+        # Without explain, stop at the first failing check and report just that one
+        reasons = []
+        for criterion in checks:
+            reason = criterion(info)
+            if reason:
+                reasons.append(reason)
+                if not explain:
+                    break
+        if reasons:
+            return False, "\n".join(reasons)
+        return True, "Matched"
+
+    return check
+
+
+@functools.lru_cache(maxsize=256)
+def compiled_criteria(criteria_key):
+    return compile_criteria(json.loads(criteria_key))
 
 
-def process_message_queue():
-    # Group messages by datecode
-    grouped_messages = defaultdict(list)
-    for datecode, text, dry_run in message_queue:
-        grouped_messages[datecode].append((text, dry_run))
+def criteria_check(criteria):
+    """Return the compiled check for criteria, reused across scans and channels."""
+    return compiled_criteria(json.dumps(criteria, sort_keys=True))
 
-    # Process messages sorted by datecode
-    for datecode in sorted(grouped_messages):
-        for text, dry_run in grouped_messages[datecode]:
+
+def memoized_check(info, criteria_key):
+    """Check a video, remembering the result per criteria across preview redraws."""
+    results = info.setdefault("_results", {})
+    if criteria_key not in results:
+        results[criteria_key] = compiled_criteria(criteria_key)(info)
+    return results[criteria_key]
+
+
+@functools.lru_cache(maxsize=64)
+def url_pattern(pattern):
+    """Compile a channel's URL rewrite pattern once rather than per video."""
+    return re.compile(pattern)
+
+
+def process_message_queue(persist=True):
+    # With every dispatcher disabled nothing is delivered, so leave pending alone
+    persist = persist and (telegram_dispatch or webhook_dispatch)
+    if persist:
+        # Messages left unsent by a crash or rate-limit exit go out first
+        with cache_lock():
+            message_queue.extend(load_pending())
+
+    # Send in datecode order; the sort is stable, so same-date messages keep queue order
+    messages = [
+        (text, dry_run)
+        for datecode, text, dry_run in sorted(message_queue, key=itemgetter(0))
+    ]
+    if batch_messages:
+        messages = batch_texts(messages)
+
+    # Keep what is still unsent on disk until it has gone out; the senders exit on
+    # failure, so the finally clause records exactly what is left at that point
+    sent = 0
+    if persist:
+        save_pending(messages)
+    try:
+        for index, (text, dry_run) in enumerate(messages):
+            if persist and index and index % PENDING_SAVE_EVERY == 0:
+                save_pending(messages[index:])
             send_webhook_message(text, dry_run=dry_run)
             send_telegram_message(text, dry_run=dry_run)
+            sent = index + 1
+    finally:
+        if persist:
+            save_pending(messages[sent:])
 
     message_queue.clear()
 
 
+def save_pending(messages):
+    with cache_lock():
+        save_json(pending_file, [text for text, dry_run in messages if not dry_run])
+
+
+def load_pending():
+    # An empty datecode sorts first, ahead of this scan's matches
+    return [("", text, False) for text in load_json(pending_file, [])]
+
+
+def batch_texts(messages, limit=MAX_MESSAGE_CHARS):
+    """Join consecutive (text, dry_run) messages into chunks up to `limit` chars."""
+    batches = []
+    for text, dry_run in messages:
+        if batches and batches[-1][1] == dry_run:
+            combined = batches[-1][0] + MESSAGE_SEPARATOR + text
+            if len(combined) <= limit:
+                batches[-1] = (combined, dry_run)
+                continue
+        batches.append((text, dry_run))
+    return batches
+
+
+class TokenBucket:
+    """Blocking token bucket; acquire() only sleeps once the budget is spent."""
+
+    def __init__(self, rate, capacity):
+        self.rate = rate
+        self.max_rate = rate
+        self.capacity = capacity
+        self.tokens = capacity
+        self.updated = time.monotonic()
+        self.lock = threading.Lock()
+
+    def _refill(self):
+        now = time.monotonic()
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def acquire(self):
+        with self.lock:
+            self._refill()
+            if self.tokens < 1:
+                # A stop request cuts the wait short so shutdown isn't held up here
+                stop_event.wait((1 - self.tokens) / self.rate)
+                self._refill()
+            self.tokens -= 1
+
+    def drain(self, seconds):
+        """Hold off the next acquire() for at least `seconds`."""
+        with self.lock:
+            self._refill()
+            self.tokens = min(self.tokens, 1 - seconds * self.rate)
+
+    def on_success(self):
+        """Recover toward the configured rate after a request went through."""
+        with self.lock:
+            self._refill()
+            self.rate = min(self.max_rate, self.rate + self.max_rate / 10)
+
+    def on_failure(self, retry_after):
+        """Back off after a rate-limit response and slow down until recovered."""
+        with self.lock:
+            self._refill()
+            self.rate = min(self.rate, 1 / retry_after)
+        self.drain(retry_after)
+
+
+# Telegram allows roughly 1 message/s per chat and 30 messages/s overall
+telegram_global_bucket = TokenBucket(rate=30.0, capacity=30)
+telegram_chat_buckets = defaultdict(lambda: TokenBucket(rate=1.0, capacity=1))
+
+# Webhooks have no published limit; start at one message/s and adapt to 429s
+webhook_bucket = TokenBucket(rate=1.0, capacity=1)
+
+# Channel listings share one budget, averaging one yt-dlp call per hammer delay
+ytdlp_bucket = TokenBucket(rate=2 / sum(HAMMER_DELAY_RANGE), capacity=fetch_workers)
+
+
 def send_telegram_message(text, dry_run=False):
     if not telegram_dispatch:
         return
@@ -268,15 +851,28 @@ def send_telegram_message(text, dry_run=False):
     else:
         print(f"{ANSI_GREEN}Sending Notifiation: {ANSI_RESET} {text}")
 
+    import requests
+
     url = f"https://api.telegram.org/bot{bot_token}/sendMessage"
     payload = {"chat_id": chat_id, "text": text, "disable_web_page_preview": False}
 
+    chat_bucket = telegram_chat_buckets[chat_id]
     retries = 0
     max_retries = 3
 
     while retries <= max_retries:
-        response = requests.post(url, json=payload)
+        telegram_global_bucket.acquire()
+        chat_bucket.acquire()
+        try:
+            response = get_http_session().post(url, json=payload, timeout=HTTP_TIMEOUT)
+        except requests.RequestException as e:
+            print(
+                f"{ANSI_RED}Request error while sending Telegram message: {e}{ANSI_RESET}"
+            )
+            sys.exit(1)
+
         if response.status_code == 200:
+            chat_bucket.on_success()
             break
         elif response.status_code == 429:
             try:
@@ -289,7 +885,7 @@ def send_telegram_message(text, dry_run=False):
                 print(
                     f"{ANSI_YELLOW}Rate limited by Telegram. Retrying after {retry_after} seconds...{ANSI_RESET}"
                 )
-                time.sleep(retry_after + 2)
+                chat_bucket.on_failure(retry_after + random.uniform(1, 3))
                 retries += 1
             except (ValueError, KeyError, json.JSONDecodeError):
                 print(
@@ -306,8 +902,6 @@ def send_telegram_message(text, dry_run=False):
         print(f"{ANSI_RED}Exceeded maximum retries. Exiting.{ANSI_RESET}")
         sys.exit(1)
 
-    time.sleep(1)
-
 
 def send_webhook_message(text, dry_run=False):
     if not webhook_dispatch:
@@ -325,14 +919,19 @@ def send_webhook_message(text, dry_run=False):
     else:
         print(f"{ANSI_GREEN}Sending Webhook Notification: {ANSI_RESET} {text}")
 
+    import requests
+
     payload = {"message": text}
 
     retries = 0
     max_retries = 3
 
     while retries <= max_retries:
+        webhook_bucket.acquire()
         try:
-            response = requests.post(webhook_url, json=payload)
+            response = get_http_session().post(
+                webhook_url, json=payload, timeout=HTTP_TIMEOUT
+            )
         except requests.RequestException as e:
             print(
                 f"{ANSI_RED}Request error while sending webhook message: {e}{ANSI_RESET}"
@@ -340,6 +939,7 @@ def send_webhook_message(text, dry_run=False):
             sys.exit(1)
 
         if response.status_code == 200 or response.status_code == 204:
+            webhook_bucket.on_success()
             break
         elif response.status_code == 429:
             try:
@@ -347,7 +947,7 @@ def send_webhook_message(text, dry_run=False):
                 print(
                     f"{ANSI_YELLOW}Rate limited by webhook. Retrying after {retry_after} seconds...{ANSI_RESET}"
                 )
-                time.sleep(retry_after + 1)
+                webhook_bucket.on_failure(retry_after + random.uniform(1, 3))
                 retries += 1
             except (ValueError, KeyError):
                 print(
@@ -364,8 +964,6 @@ def send_webhook_message(text, dry_run=False):
         print(f"{ANSI_RED}Exceeded maximum retries. Exiting.{ANSI_RESET}")
         sys.exit(1)
 
-    time.sleep(1)
-
 
 def print_channel_settings(channel):
     url = channel.get("url", "N/A")
@@ -392,27 +990,31 @@ def print_channel_settings(channel):
 
 
 def preview_recent_videos(
-    url, criteria, playlist_end, url_regex=None, skip_result=False
+    url,
+    criteria,
+    playlist_end,
+    url_regex=None,
+    skip_result=False,
+    videos=None,
+    cname=None,
 ):
-    print("\nFetching recent videos to preview matches...")
-    videos, cname = get_latest_videos(url, playlist_end=playlist_end)
+    # Callers pass back a previous fetch so re-previews only re-score and re-render
+    if videos is None:
+        print("\nFetching recent videos to preview matches...")
+        videos, cname = get_latest_videos(url, playlist_end=playlist_end)
     if not videos:
         print("No videos found or error fetching.")
         return None, None
 
-    table = prettytable.PrettyTable()
-
     if skip_result:
-        table.field_names = ["Title", "Duration", "URL"]
+        headers = ["Title", "Duration", "URL"]
     else:
-        table.field_names = ["Title", "Duration", "Result", "URL"]
-
-    table.max_width["URL"] = 60
-    table.max_width["Title"] = 70
-    table.hrules = prettytable.HRuleStyle.ALL
+        headers = ["Title", "Duration", "Result", "URL"]
+    rows = []
 
+    criteria_key = json.dumps(criteria, sort_keys=True)
     for video in videos:
-        reason = explain_skip_reason(video, criteria)
+        matched, reason = memoized_check(video, criteria_key)
         duration_val = video.get("duration")
         raw_title = video.get("title", "N/A")
 
@@ -422,7 +1024,7 @@ def preview_recent_videos(
         if url_regex:
             try:
                 pattern, repl = url_regex
-                modified_url = re.sub(pattern, repl, video_url)
+                modified_url = url_pattern(pattern).sub(repl, video_url)
             except Exception as e:
                 modified_url = f"Regex error: {e}"
 
@@ -431,81 +1033,103 @@ def preview_recent_videos(
         else:
             duration_str = "N/A"
 
-        title_lines = [raw_title[i : i + 60] for i in range(0, len(raw_title), 60)]
+        title_lines = textwrap.wrap(raw_title, 60, break_on_hyphens=False) or [""]
 
-        if reason == "Matched" and not skip_result:
-            colored_title_lines = [
-                f"{ANSI_GREEN}{line}{ANSI_RESET}" for line in title_lines
-            ]
-            colored_duration = f"{ANSI_GREEN}{duration_str}{ANSI_RESET}"
+        reason_lc = reason.lower()
+        if matched and not skip_result:
+            color_title = "\n".join(map(ANSI_GREEN_FMT.format, title_lines))
+            colored_duration = ANSI_GREEN_FMT.format(duration_str)
         else:
-            if "title" in reason.lower() and not skip_result:
-                colored_title_lines = [
-                    f"{ANSI_RED}{line}{ANSI_RESET}" for line in title_lines
-                ]
+            if "title" in reason_lc and not skip_result:
+                color_title = "\n".join(map(ANSI_RED_FMT.format, title_lines))
             else:
-                colored_title_lines = title_lines
+                color_title = "\n".join(title_lines)
 
-            if (
-                "short" in reason.lower() or "long" in reason.lower()
-            ) and not skip_result:
-                colored_duration = f"{ANSI_RED}{duration_str}{ANSI_RESET}"
+            if ("short" in reason_lc or "long" in reason_lc) and not skip_result:
+                colored_duration = ANSI_RED_FMT.format(duration_str)
             else:
                 colored_duration = duration_str
 
-        color_title = "\n".join(colored_title_lines)
-
         if url_regex:
             url_display = f"{ANSI_RED}IN:{ANSI_RESET}{video_url}\n{ANSI_GREEN}OUT:{ANSI_RESET}{modified_url}"
         else:
             url_display = f"{video_url}"
 
         if skip_result:
-            table.add_row([color_title, colored_duration, url_display])
+            rows.append([color_title, colored_duration, url_display])
         else:
-            table.add_row([color_title, colored_duration, reason, url_display])
+            rows.append([color_title, colored_duration, reason, url_display])
 
     print("\nRecent videos analysis:")
-    print(table)
+    print(render_table(headers, rows, max_widths={"Title": 70, "URL": 60}))
     return videos, cname
 
 
-def explain_skip_reason(info, criteria):
-    reasons = []
-
-    title = info.get("title", "").lower()
-    description = info.get("description", "").lower()
-    duration = info.get("duration", 0)
-
-    includes = criteria.get("title_include", [])
-    if includes and not any(word.lower() in title for word in includes):
-        reasons.append(f"Title missing: {includes}")
-
-    excludes = criteria.get("title_exclude", [])
-    if any(word.lower() in title for word in excludes):
-        reasons.append(f"Title excluded: {excludes}")
-
-    desc_includes = criteria.get("description_include", [])
-    if desc_includes and not any(word.lower() in description for word in desc_includes):
-        reasons.append(f"Description missing: {desc_includes}")
+def visible_len(text):
+    # Terminal columns: ANSI codes take none, wide (e.g. CJK) characters take two
+    return sum(
+        2 if unicodedata.east_asian_width(char) in "WF" else 1
+        for char in ANSI_PATTERN.sub("", text)
+    )
 
-    desc_excludes = criteria.get("description_exclude", [])
-    if any(word.lower() in description for word in desc_excludes):
-        reasons.append(f"Description excluded: {desc_excludes}")
 
-    min_length = criteria.get("min_length_seconds", 0)
-    if min_length and duration < min_length:
-        reasons.append(f"Too short ({duration}s)")
+def wrap_ansi(line, width):
+    """Split a line into chunks of at most `width` columns, carrying colors over."""
+    if visible_len(line) <= width:
+        return [line]
 
-    max_length = criteria.get("max_length_seconds", 0)
-    if max_length and duration > max_length:
-        reasons.append(f"Too long ({duration}s)")
+    chunks, current, used, color = [], "", 0, ""
+    for token in ANSI_SPLIT_PATTERN.split(line):
+        if ANSI_PATTERN.fullmatch(token):
+            current += token
+            color = "" if token == ANSI_RESET else token
+            continue
+        for char in token:
+            char_width = visible_len(char)
+            if used + char_width > width:
+                chunks.append(current + (ANSI_RESET if color else ""))
+                current, used = color, 0
+            current += char
+            used += char_width
+    chunks.append(current)
+    return chunks
+
+
+def render_table(headers, rows, max_widths=None):
+    """Render rows of (possibly multi-line, colored) cells as a bordered text table."""
+    max_widths = max_widths or {}
+    limits = [max_widths.get(header) for header in headers]
+
+    def split_cell(cell, limit):
+        lines = str(cell).split("\n")
+        if limit:
+            lines = [chunk for line in lines for chunk in wrap_ansi(line, limit)]
+        return lines
+
+    table = [
+        [split_cell(cell, limit) for cell, limit in zip(row, limits)]
+        for row in [headers] + rows
+    ]
+    widths = [
+        max(visible_len(line) for row in table for line in row[column])
+        for column in range(len(headers))
+    ]
+    border = "+" + "+".join("-" * (width + 2) for width in widths) + "+"
 
-    return "\n".join(reasons) if reasons else "Matched"
+    output = [border]
+    for row in table:
+        for index in range(max(len(cell) for cell in row)):
+            parts = []
+            for cell, width in zip(row, widths):
+                line = cell[index] if index < len(cell) else ""
+                parts.append(line + " " * (width - visible_len(line)))
+            output.append("| " + " | ".join(parts) + " |")
+        output.append(border)
+    return "\n".join(output)
 
 
 def load_regex_presets(presets_file):
-    return load_json(presets_file, {})
+    return load_if_changed((presets_file,), lambda: load_json(presets_file, {}))
 
 
 def save_regex_presets(presets_file, presets):
@@ -516,8 +1140,10 @@ def interactive_edit_regex_presets(presets_file):
     presets = load_regex_presets(presets_file)
 
     while True:
+        names = list(presets)  # The numbering shown is the one used to resolve input
         print("\nCurrent Presets:")
-        for idx, (name, (pattern, replacement)) in enumerate(presets.items()):
+        for idx, name in enumerate(names):
+            pattern, replacement = presets[name]
             print(
                 f"[{idx}] {name} =>\n\tpattern: {pattern},\n\treplacement: {replacement}"
             )
@@ -542,7 +1168,7 @@ def interactive_edit_regex_presets(presets_file):
         elif action == "e":
             try:
                 idx = int(input("Enter preset number to edit: ").strip())
-                name = list(presets.keys())[idx]
+                name = names[idx]
                 print(f"Editing preset: {name}")
                 pattern = input(
                     f"Enter new regex pattern (leave blank to keep '{presets[name][0]}'): "
@@ -562,7 +1188,7 @@ def interactive_edit_regex_presets(presets_file):
         elif action == "d":
             try:
                 idx = int(input("Enter preset number to delete: ").strip())
-                name = list(presets.keys())[idx]
+                name = names[idx]
                 confirm = (
                     input(f"Are you sure you want to delete preset '{name}'? (y/n): ")
                     .strip()
@@ -601,14 +1227,16 @@ def choose_url_regex():
             if not presets:
                 print(f"{ANSI_RED}No presets available.{ANSI_RESET}")
                 continue
+            names = list(presets)
             print("\nAvailable Presets:")
-            for idx, (name, (pattern, replacement)) in enumerate(presets.items()):
+            for idx, name in enumerate(names):
+                pattern, replacement = presets[name]
                 print(
                     f"[{idx}] {name} =>\n\tpattern: {pattern},\n\treplacement: {replacement}"
                 )
             try:
                 idx = int(input("Select preset number: ").strip())
-                name = list(presets.keys())[idx]
+                name = names[idx]
                 pattern, replacement = presets[name]
                 return [pattern, replacement]
             except (ValueError, IndexError):
@@ -660,9 +1288,11 @@ def interactive_add_channel(channels_file):
     playlist_end = 25
     url_regex = None
 
+    fetched_end = playlist_end
+
     while True:
         url = input("Enter the channel URL: ").strip()
-        videos, discarded = preview_recent_videos(
+        videos, cname = preview_recent_videos(
             url, criteria, playlist_end, url_regex, skip_result=True
         )
 
@@ -684,6 +1314,9 @@ def interactive_add_channel(channels_file):
     except ValueError:
         print("Invalid input, defaulting to 25.")
 
+    if playlist_end != fetched_end:
+        videos = None  # Fetch again once at the chosen count
+
     while True:
         if input("Filter by title includes? (y/n): ").strip().lower() == "y":
             includes = input("Enter title keywords (comma separated): ").strip()
@@ -731,8 +1364,14 @@ def interactive_add_channel(channels_file):
         ):
             url_regex = choose_url_regex()
 
-        videos, discarded = preview_recent_videos(
-            url, criteria, playlist_end, url_regex, skip_result=False
+        videos, cname = preview_recent_videos(
+            url,
+            criteria,
+            playlist_end,
+            url_regex,
+            skip_result=False,
+            videos=videos,
+            cname=cname,
         )
         channel = {
             "url": url,
@@ -751,7 +1390,7 @@ def interactive_add_channel(channels_file):
         )
         if confirm == "y":
             channels = load_channels(channels_file, skip_add=True)
-            channels.append(channel)
+            bisect.insort(channels, channel, key=channel_sort_key)
             save_channels(channels_file, channels)
             print("Channel added.")
             if (
@@ -799,9 +1438,8 @@ def interactive_edit_channel(channels_file):
 
     print(f"\nEditing: {url}")
 
-    videos, discarded = preview_recent_videos(
-        url, criteria, playlist_end, current_regex
-    )
+    videos, cname = preview_recent_videos(url, criteria, playlist_end, current_regex)
+    fetched_end = playlist_end
     print_channel_settings(channel)
 
     confirm = (
@@ -825,6 +1463,15 @@ def interactive_edit_channel(channels_file):
         except ValueError:
             print("Invalid number. Keeping old playlist_end.")
 
+        try:
+            new_interval = input(
+                f"Current check_interval_hours={channel.get('check_interval_hours') or 'default'}. Enter new value (0 for --interval-hours) or leave blank to keep: "
+            ).strip()
+            if new_interval:
+                channel["check_interval_hours"] = float(new_interval)
+        except ValueError:
+            print("Invalid number. Keeping old check_interval_hours.")
+
         fields = [
             ("title_include", list),
             ("title_exclude", list),
@@ -866,7 +1513,7 @@ def interactive_edit_channel(channels_file):
 
         channel["criteria"] = criteria
 
-        print(f"\nCurrent URL regex: {current_regex}")
+        print(f"\nCurrent URL regex: {channel.get('url_regex')}")
         action = (
             input("Modify URL regex? (s=set new, c=clear, n=none): ").strip().lower()
         )
@@ -881,7 +1528,9 @@ def interactive_edit_channel(channels_file):
                         original_url = sample_video.get("url", "")
                         modified_url = original_url
                         try:
-                            modified_url = re.sub(pattern, replacement, original_url)
+                            modified_url = url_pattern(pattern).sub(
+                                replacement, original_url
+                            )
                         except Exception as e:
                             print(f"{ANSI_RED}Regex error:{ANSI_RESET} {e}")
                         print(f"Original: {original_url}")
@@ -902,16 +1551,31 @@ def interactive_edit_channel(channels_file):
         elif action == "c":
             channel["url_regex"] = None
 
-        preview_recent_videos(url, criteria, playlist_end, current_regex)
-        print_channel_settings(channel)
+        if playlist_end != fetched_end:
+            videos = None  # Fetch again once at the new count
+        while True:
+            videos, cname = preview_recent_videos(
+                url,
+                criteria,
+                playlist_end,
+                channel.get("url_regex"),
+                videos=videos,
+                cname=cname,
+            )
+            fetched_end = playlist_end
+            print_channel_settings(channel)
 
-        confirm = (
-            input(
-                "Are you happy with these filters? (y to save, e to edit again, n to abort): "
+            confirm = (
+                input(
+                    "Are you happy with these filters? (y to save, e to edit again, r to refresh preview, n to abort): "
+                )
+                .strip()
+                .lower()
             )
-            .strip()
-            .lower()
-        )
+            if confirm != "r":
+                break
+            videos = None
+
         if confirm == "y":
             channels[selection] = channel
             save_channels(channels_file, channels)
@@ -938,73 +1602,185 @@ def interactive_edit_channel(channels_file):
 
 
 def run_all_channels(
-    channels_file, dry_run=False, suppress_skip_msgs=False, seen_during_dry_run=False
+    channels_file,
+    dry_run=False,
+    suppress_skip_msgs=False,
+    seen_during_dry_run=False,
 ):
-    channels = load_channels(channels_file)
+    channels = load_if_changed((channels_file,), lambda: load_channels(channels_file))
+    channels = [c for c in channels if c.get("url")]
+    now = time.monotonic()
+    due = [c for c in channels if channel_due_in(c, now) <= 0]
+    cache_paths = (cache_file, seen_log_file)
+    seen_videos = load_if_changed(cache_paths, lambda: load_cache(cache_file))
+
+    # Fetches are I/O bound and independent per channel; results are processed
+    # on this thread as they complete so the cache and queue stay single-writer.
+    executor = ThreadPoolExecutor(max_workers=fetch_workers)
+    try:
+        futures = {
+            executor.submit(
+                fetch_channel, channel, seen_videos.get(channel["url"]), scheduled=True
+            ): channel
+            for channel in due
+        }
+        for future in as_completed(futures):
+            videos, cname = future.result()
+            process_channel(
+                futures[future],
+                videos,
+                cname,
+                dry_run,
+                suppress_skip_msgs,
+                seen_during_dry_run,
+                seen_videos,
+            )
+    finally:
+        # On a signal, drop fetches that haven't started rather than run them all
+        executor.shutdown(cancel_futures=True)
+
+    for channel in due:
+        last_checked[channel["url"]] = now
+    # Seconds until the next channel comes due, for the interval loop to sleep
+    now = time.monotonic()
+    return min(
+        (channel_due_in(c, now) for c in channels), default=interval_hours * 3600
+    )
+
+
+def channel_due_in(channel, now):
+    """Seconds until a channel's check interval has elapsed; 0 or less when due."""
+    hours = channel.get("check_interval_hours") or interval_hours
+    last = last_checked.get(channel["url"])
+    if last is None:
+        return 0
+    return last + hours * 3600 - now
+
+
+def fetch_channel(channel, seen_ids=None, scheduled=False):
+    url = channel.get("url")
+    # Only scheduled scans trust the feed; add/edit previews fill feed_state too
+    if scheduled:
+        if stop_event.is_set():
+            return [], None
+        if feed_unchanged(url):
+            print(f"{ANSI_GREY}No new uploads:{ANSI_RESET} {url}")
+            return [], None
+        ytdlp_bucket.acquire()
+        if stop_event.is_set():
+            return [], None
 
-    for channel in channels:
-        run_channel(channel, dry_run, suppress_skip_msgs, seen_during_dry_run)
-        time.sleep(random.randint(*HAMMER_DELAY_RANGE))
+    print(f"{ANSI_GREEN}Checking channel:{ANSI_RESET} {url}")
+    return get_latest_videos(
+        url,
+        playlist_end=channel.get("playlist_end", 25),
+        stop_ids=seen_ids if assume_sorted else None,
+    )
+
+
+def lookup_upload_date(video_url):
+    # Shares the listings' budget, so lookups don't burst past the hammer delay
+    ytdlp_bucket.acquire()
+    if stop_event.is_set():
+        return None
+    return get_video_upload_date(video_url)
 
 
 def run_channel(
     channel, dry_run=False, suppress_skip_msgs=False, seen_during_dry_run=False
+):
+    if not channel.get("url"):
+        return
+
+    videos, cname = fetch_channel(channel, load_cache(cache_file).get(channel["url"]))
+    process_channel(
+        channel, videos, cname, dry_run, suppress_skip_msgs, seen_during_dry_run
+    )
+
+
+def process_channel(
+    channel,
+    videos,
+    cname,
+    dry_run=False,
+    suppress_skip_msgs=False,
+    seen_during_dry_run=False,
+    seen_videos=None,
 ):
     url = channel.get("url")
     criteria = channel.get("criteria", {})
-    playlist_end = channel.get("playlist_end", 25)
     url_regex = channel.get("url_regex")
-    seen_videos = load_cache(cache_file)
-
-    if not url:
-        return
-
-    print(f"{ANSI_GREEN}Checking channel:{ANSI_RESET} {url}")
-    videos, cname = get_latest_videos(url, playlist_end=playlist_end)
-    channel_cache = set(seen_videos.get(url, []))
+    if seen_videos is None:
+        seen_videos = load_cache(cache_file)
+    channel_cache = seen_videos.setdefault(url, OrderedDict())
+    check = criteria_check(criteria)
+
+    if assume_sorted:
+        # Anything older than the newest seen video was handled by an earlier scan
+        for index in range(len(videos) - 1, -1, -1):
+            if videos[index]["id"] in channel_cache:
+                videos = videos[index:]
+                break
 
+    pending = []
     for video in videos:
         video_id = video["id"]
         if video_id in channel_cache:
+            channel_cache.move_to_end(video_id)
             if not suppress_skip_msgs:
                 print(
                     f"{ANSI_GREY}Already seen:{ANSI_RESET} {video_id} -- {video['title']}"
                 )
             continue
-        if matches_filters(video, criteria):
+        matched, reason = check(video, explain=not suppress_skip_msgs)
+        if matched:
             video_url = video["url"]
             if url_regex:
                 try:
                     pattern, repl = url_regex
-                    video_url = re.sub(pattern, repl, video_url)
+                    video_url = url_pattern(pattern).sub(repl, video_url)
                 except Exception as e:
                     print(f"{ANSI_RED}Failed applying URL regex:{ANSI_RESET} {e}")
-
-            upload_date = get_video_upload_date(video_url) or video.get(
-                "upload_date", ""
-            )
-
-            message = f"{cname} :: {upload_date} :: {video['title']}\n\n{video_url}"
-            message_queue.append((upload_date, message, dry_run))
-            print(f"{ANSI_BLUE}Queued for:{ANSI_RESET}  {video_id} -- {video['title']}")
-            if seen_during_dry_run or not dry_run:
-                channel_cache.add(video_id)
+            pending.append((video, video_url))
         else:
             if not suppress_skip_msgs:
+                reason = reason.replace("\n", "; ")
                 print(
-                    f"{ANSI_YELLOW}Not matched:{ANSI_RESET} {video_id} -- {ANSI_GREY}{video['title']}{ANSI_RESET}"
+                    f"{ANSI_YELLOW}Not matched:{ANSI_RESET} {video_id} -- {ANSI_GREY}{video['title']}{ANSI_RESET} ({reason})"
                 )
 
-    seen_videos[url] = list(channel_cache)
-    save_cache(cache_file, seen_videos)
-    return
-
+    # Each upload date costs a yt-dlp call; overlap them within the shared budget
+    upload_dates = []
+    if pending:
+        executor = ThreadPoolExecutor(max_workers=fetch_workers)
+        try:
+            upload_dates = list(
+                executor.map(lookup_upload_date, [u for _, u in pending])
+            )
+        finally:
+            executor.shutdown(cancel_futures=True)
 
-def chunked_sleep(total_seconds, check_interval=3):
-    slept = 0
-    while slept < total_seconds:
-        time.sleep(min(check_interval, total_seconds - slept))
-        slept += check_interval
+    for (video, video_url), upload_date in zip(pending, upload_dates):
+        video_id = video["id"]
+        upload_date = upload_date or video.get("upload_date", "")
+
+        message = f"{cname} :: {upload_date} :: {video['title']}\n\n{video_url}"
+        message_queue.append((upload_date, message, dry_run))
+        print(f"{ANSI_BLUE}Queued for:{ANSI_RESET}  {video_id} -- {video['title']}")
+        if seen_during_dry_run or not dry_run:
+            channel_cache[video_id] = None
+            append_seen(url, video_id)
+
+    # Evict least recently seen IDs in batches so the journal stays the common path
+    cap = seen_cap(channel)
+    if len(channel_cache) > cap + channel.get("playlist_end", 25):
+        with cache_lock():
+            # Rewriting truncates the journal, so fold in other instances' IDs first
+            merge_cache(seen_videos, load_cache(cache_file))
+            while len(channel_cache) > cap:
+                channel_cache.popitem(last=False)
+            save_cache(cache_file, seen_videos)
+    return
 
 
 # === MAIN ===
@@ -1051,32 +1827,94 @@ if __name__ == "__main__":
         action="store_true",
         help="Disable Webhook message dispatch.",
     )
+    parser.add_argument(
+        "--batch",
+        action=argparse.BooleanOptionalAction,
+        default=False,
+        help="Combine queued notifications into as few messages as possible.",
+    )
+    backend = parser.add_mutually_exclusive_group()
+    backend.add_argument(
+        "--use-lib",
+        dest="use_lib",
+        action="store_true",
+        help="Call yt-dlp in-process through the yt_dlp Python module.",
+    )
+    backend.add_argument(
+        "--use-subprocess",
+        dest="use_lib",
+        action="store_false",
+        help="Run the yt-dlp command for each lookup (default).",
+    )
+    ordering = parser.add_mutually_exclusive_group()
+    ordering.add_argument(
+        "--assume-sorted",
+        dest="assume_sorted",
+        action="store_true",
+        default=True,
+        help="Stop scanning a channel at its newest already-seen video (default).",
+    )
+    ordering.add_argument(
+        "--strict-sorted",
+        dest="assume_sorted",
+        action="store_false",
+        help="Check every listed video, even older than an already-seen one.",
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=4,
+        help="Number of channels to fetch concurrently in run mode.",
+    )
     args = parser.parse_args()
 
     data_dir = args.data_dir
     ensure_dir(data_dir)
     config_file = os.path.join(data_dir, "config.json")
 
-    if not os.path.exists(config_file):
+    # One listing answers every existence question below
+    data_names = dir_names(data_dir)
+    if "config.json" not in data_names and "data" in data_names:
         second_dir = os.path.join(data_dir, "data")
-        second_file = os.path.join(second_dir, "config.json")
-        if os.path.exists(second_file):
+        second_names = dir_names(second_dir)
+        if "config.json" in second_names:
             data_dir = second_dir
-            config_file = second_file
+            data_names = second_names
+            config_file = os.path.join(second_dir, "config.json")
 
     channels_file = os.path.join(data_dir, "channels.json")
     cache_file = os.path.join(data_dir, "seen_videos.json")
+    seen_log_file = os.path.join(data_dir, "seen_videos.log")
+    pending_file = os.path.join(data_dir, "pending_messages.json")
     regex_file = os.path.join(data_dir, "regex_presets.json")
     netrc_file = os.path.join(data_dir, "netrc")
+    cookie_file = os.path.join(data_dir, "cookies.txt")
+    ydl_cache_dir = os.path.join(data_dir, "ydl-cache")
+    ensure_dir(ydl_cache_dir)
     telegram_dispatch = not args.disable_telegram_dispatch
     webhook_dispatch = not args.disable_webhook_dispatch
+    batch_messages = args.batch
+    fetch_workers = max(1, args.workers)
+    assume_sorted = args.assume_sorted
+    interval_hours = args.interval_hours
+    ytdlp_bucket = TokenBucket(rate=ytdlp_bucket.rate, capacity=fetch_workers)
+
+    # yt_dlp takes a while to import, so only the modes that fetch listings load it
+    if args.use_lib and args.mode not in ("config", "regex"):
+        try:
+            import yt_dlp
+        except ImportError:
+            print(
+                f"{ANSI_RED}--use-lib requires the yt_dlp module (pip install yt-dlp).{ANSI_RESET}"
+            )
+            sys.exit(1)
 
     if args.mode == "config":
         edit_config(config_file)
         sys.exit(0)
 
     config = load_config(config_file)
-    using_netrc = os.path.exists(netrc_file)
+    using_netrc = "netrc" in data_names
     if not using_netrc:
         print(
             f"{ANSI_YELLOW}Tip: Create a netrc file at "
@@ -1098,17 +1936,25 @@ if __name__ == "__main__":
     dry_run = args.mode == "dry-run"
 
     if args.mode in ("run", "dry-run"):
+        compact_cache(cache_file)
         while True:
-            run_all_channels(
+            next_due = run_all_channels(
                 channels_file,
                 dry_run=dry_run,
                 suppress_skip_msgs=args.suppress_skip_msgs,
                 seen_during_dry_run=args.seen_during_dry_run,
             )
-            process_message_queue()
+            process_message_queue(persist=not dry_run)
+            if yt_dlp:
+                save_ytdlp_cookies()
+            compact_cache(cache_file, SEEN_LOG_COMPACT_RATIO)
             if args.interval_hours <= 0:
                 break
+            # Wake when the next channel is due, at most one interval from now
+            sleep_for = max(60, min(next_due, args.interval_hours * 3600))
             print(
-                f"{ANSI_BLUE}Sleeping for {args.interval_hours} hours before next scan...{ANSI_RESET}"
+                f"{ANSI_BLUE}Sleeping for {sleep_for / 3600:.2f} hours before next scan...{ANSI_RESET}"
             )
-            chunked_sleep(args.interval_hours * 3600)
+            # One timed wait; a signal ends it at once instead of at a poll tick
+            if stop_event.wait(sleep_for):
+                break